@@ -1,384 +1,665 @@
-import streamlit as st
-import numpy as np
-from PIL import Image
-import tempfile
-import os
-import av
-
-
-
-# Try to import OpenCV with specific version
-try:
-    import cv2
-    OPENCV_AVAILABLE = True
-except ImportError as e:
-    OPENCV_AVAILABLE = False
-    st.sidebar.warning("⚠️ OpenCV not available - video features disabled")
-
-try:
-    from streamlit_webrtc import webrtc_streamer, WebRtcMode, VideoProcessorBase
-    WEBRTC_AVAILABLE = True
-except ImportError:
-    WEBRTC_AVAILABLE = False
-
-# Set page configuration
-st.set_page_config(
-    page_title="ASCII Art Converter",
-    page_icon="🎨",
-    layout="wide"
-)
-
-# Custom CSS
-st.markdown("""
-<style>
-    .ascii-art {
-        font-family: 'Courier New', monospace;
-        line-height: 1;
-        white-space: pre;
-        overflow-x: auto;
-        font-size: 8px;
-    }
-    .video-container {
-        max-width: 100%;
-        border-radius: 10px;
-    }
-    .stButton button {
-        width: 100%;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-class StreamlitASCIIConverter:
-    def __init__(self):
-        self.chars = "@%#*+=-:. "
-        self.precompute_char_mapping()
-    
-    def precompute_char_mapping(self):
-        self.char_map = {}
-        for pixel_value in range(256):
-            scale = len(self.chars) - 1
-            char_index = min(int(pixel_value / 255 * scale), scale)
-            self.char_map[pixel_value] = self.chars[char_index]
-    
-    def frame_to_ascii(self, frame, width=80, color_mode=True):
-        """Convert frame to ASCII art"""
-        try:
-            if frame is None:
-                return "<pre>No frame</pre>", 0, 0
-                
-            original_height, original_width = frame.shape[:2]
-            aspect_ratio = original_height / original_width
-            
-            target_width = min(width, 120)
-            target_height = int(target_width * aspect_ratio * 0.5)
-            target_height = max(10, min(target_height, 80))
-            
-            # Resize frame
-            frame_resized = cv2.resize(frame, (target_width, target_height))
-            frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-            frame_gray = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2GRAY)
-            
-            # Convert to ASCII
-            ascii_html = '<pre class="ascii-art">'
-            
-            for y in range(target_height):
-                line_html = ""
-                for x in range(target_width):
-                    brightness = frame_gray[y, x]
-                    char = self.char_map[brightness]
-                    
-                    if color_mode:
-                        r, g, b = frame_rgb[y, x]
-                        line_html += f"<span style='color: rgb({r},{g},{b})'>{char}</span>"
-                    else:
-                        line_html += char
-                
-                ascii_html += line_html + "\n"
-            
-            ascii_html += "</pre>"
-            return ascii_html, target_width, target_height
-            
-        except Exception as e:
-            return f"<pre>Error: {str(e)}</pre>", 0, 0
-    
-    def image_to_ascii(self, image, width=80, color_mode=True):
-        """Convert PIL Image to ASCII art"""
-        try:
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            original_width, original_height = image.size
-            aspect_ratio = original_height / original_width
-            
-            target_width = min(width, 120)
-            target_height = int(target_width * aspect_ratio * 0.5)
-            target_height = max(10, min(target_height, 80))
-            
-            img_resized = image.resize((target_width, target_height))
-            img_gray = image.convert('L').resize((target_width, target_height))
-            
-            pixels_rgb = np.array(img_resized)
-            pixels_gray = np.array(img_gray)
-            
-            ascii_html = '<pre class="ascii-art">'
-            
-            for y in range(target_height):
-                line_html = ""
-                for x in range(target_width):
-                    brightness = pixels_gray[y, x]
-                    char = self.char_map[brightness]
-                    
-                    if color_mode:
-                        r, g, b = pixels_rgb[y, x]
-                        line_html += f"<span style='color: rgb({r},{g},{b})'>{char}</span>"
-                    else:
-                        line_html += char
-                
-                ascii_html += line_html + "\n"
-            
-            ascii_html += "</pre>"
-            return ascii_html, target_width, target_height
-            
-        except Exception as e:
-            return f"<pre>Error: {str(e)}</pre>", 0, 0
-
-def main():
-    st.title("🎨 ASCII Art Converter")
-    st.markdown("Convert images, videos, and access webcam to create ASCII art!")
-    
-    # Initialize converter
-    converter = StreamlitASCIIConverter()
-    
-    # Sidebar settings
-    st.sidebar.title("⚙️ Settings")
-    ascii_width = st.sidebar.slider("ASCII Width", 30, 120, 80)
-    color_mode = st.sidebar.checkbox("Color Mode", value=True)
-    
-    # Main app
-    input_type = st.radio(
-        "Choose input type:",
-        ["Image", "Video", "Webcam"],
-        horizontal=True
-    )
-    
-    if input_type == "Image":
-        handle_image_input(converter, ascii_width, color_mode)
-    elif input_type == "Video":
-        if OPENCV_AVAILABLE:
-            handle_video_input(converter, ascii_width, color_mode)
-        else:
-            st.error("❌ Video processing requires OpenCV. This feature is not available in the current deployment.")
-            st.info("🔧 Try deploying with the compatible OpenCV version in requirements.txt")
-    elif input_type == "Webcam":
-        if OPENCV_AVAILABLE:
-            handle_webcam_input(converter, ascii_width, color_mode)
-        else:
-            st.error("❌ Webcam access requires OpenCV. This feature is not available in the current deployment.")
-            st.info("🔧 Try running this app locally for full webcam support")
-
-def handle_image_input(converter, ascii_width, color_mode):
-    st.subheader("📷 Image to ASCII")
-    
-    uploaded_file = st.file_uploader(
-        "Choose an image file", 
-        type=['jpg', 'jpeg', 'png', 'bmp', 'tiff', 'gif']
-    )
-    
-    if uploaded_file is not None:
-        try:
-            image = Image.open(uploaded_file)
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("Original Image")
-                st.image(image, use_column_width=True)
-                st.caption(f"Size: {image.size[0]} x {image.size[1]}")
-            
-            with col2:
-                st.subheader("ASCII Art")
-                with st.spinner("Converting..."):
-                    ascii_html, width, height = converter.image_to_ascii(
-                        image, ascii_width, color_mode
-                    )
-                    st.markdown(ascii_html, unsafe_allow_html=True)
-                    st.caption(f"ASCII: {width} x {height} chars")
-                    
-        except Exception as e:
-            st.error(f"Error: {str(e)}")
-
-def handle_video_input(converter, ascii_width, color_mode):
-    st.subheader("🎥 Video to ASCII")
-    
-    uploaded_file = st.file_uploader(
-        "Choose a video file", 
-        type=['mp4', 'avi', 'mov', 'mkv']
-    )
-    
-    if uploaded_file is not None:
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-            tmp_file.write(uploaded_file.read())
-            video_path = tmp_file.name
-        
-        try:
-            cap = cv2.VideoCapture(video_path)
-            
-            if not cap.isOpened():
-                st.error("❌ Could not open video file")
-                return
-            
-            # Get video info
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            
-            if total_frames > 0:
-                st.info(f"📊 Video Info: {total_frames} frames, {fps:.1f} FPS")
-                
-                # Frame navigation
-                frame_number = st.slider("Select Frame", 0, total_frames-1, 0, key="video_frame")
-                
-                # Navigation buttons
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    if st.button("⏮️ First Frame"):
-                        frame_number = 0
-                        st.rerun()
-                with col2:
-                    if st.button("▶️ Play Animation"):
-                        play_video_animation(cap, converter, ascii_width, color_mode)
-                with col3:
-                    if st.button("⏭️ Last Frame"):
-                        frame_number = total_frames - 1
-                        st.rerun()
-                
-                # Display selected frame
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-                ret, frame = cap.read()
-                
-                if ret:
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.subheader("Original Frame")
-                        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        st.image(frame_rgb, use_column_width=True)
-                        st.caption(f"Frame {frame_number}/{total_frames-1}")
-                    
-                    with col2:
-                        st.subheader("ASCII Art")
-                        ascii_html, width, height = converter.frame_to_ascii(
-                            frame, ascii_width, color_mode
-                        )
-                        st.markdown(ascii_html, unsafe_allow_html=True)
-                        st.caption(f"ASCII: {width} x {height} chars")
-            
-        except Exception as e:
-            st.error(f"Video processing error: {str(e)}")
-        finally:
-            if 'cap' in locals():
-                cap.release()
-            if os.path.exists(video_path):
-                os.unlink(video_path)
-
-def handle_webcam_input(converter, ascii_width, color_mode):
-    st.subheader("📹 Webcam to ASCII")
-    
-    st.info("""
-    **Webcam Access Notes:**
-    - Works best in local deployment
-    - Cloud deployment may have limited camera access
-    - Grant camera permissions when prompted
-    - Use Chrome/Firefox for best compatibility
-    """)
-    
-    # Webcam access using OpenCV
-    if st.button("🎥 Start Webcam"):
-        webcam_placeholder = st.empty()
-        info_placeholder = st.empty()
-        stop_button = st.button("🛑 Stop Webcam")
-        
-        cap = cv2.VideoCapture(0)
-        
-        if not cap.isOpened():
-            st.error("❌ Could not access webcam")
-            return
-        
-        # Set camera properties
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        cap.set(cv2.CAP_PROP_FPS, 15)
-        
-        frame_count = 0
-        start_time = time.time()
-        
-        try:
-            while not stop_button:
-                ret, frame = cap.read()
-                if not ret:
-                    st.error("❌ Failed to capture frame")
-                    break
-                
-                # Convert to ASCII
-                ascii_html, width, height = converter.frame_to_ascii(
-                    frame, ascii_width, color_mode
-                )
-                
-                # Calculate FPS
-                frame_count += 1
-                current_time = time.time()
-                elapsed_time = current_time - start_time
-                fps = frame_count / elapsed_time if elapsed_time > 0 else 0
-                
-                # Update display
-                webcam_placeholder.markdown(ascii_html, unsafe_allow_html=True)
-                info_placeholder.info(
-                    f"📊 Frame: {frame_count} | FPS: {fps:.1f} | "
-                    f"Size: {width}x{height} | Color: {'ON' if color_mode else 'OFF'}"
-                )
-                
-                # Check for stop
-                if stop_button:
-                    break
-                
-                # Control frame rate
-                time.sleep(0.05)
-                
-        except Exception as e:
-            st.error(f"Webcam error: {str(e)}")
-        finally:
-            cap.release()
-            st.success("✅ Webcam stopped")
-
-def play_video_animation(cap, converter, ascii_width, color_mode):
-    """Play video as animation"""
-    st.info("🎬 Playing video animation...")
-    
-    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-    animation_placeholder = st.empty()
-    stop_animation = st.button("⏹️ Stop Animation")
-    
-    try:
-        while not stop_animation:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Convert frame to ASCII
-            ascii_html, width, height = converter.frame_to_ascii(
-                frame, ascii_width, color_mode
-            )
-            
-            # Update animation
-            animation_placeholder.markdown(ascii_html, unsafe_allow_html=True)
-            
-            # Small delay
-            time.sleep(0.1)
-            
-            if stop_animation:
-                break
-                
-    except Exception as e:
-        st.error(f"Animation error: {str(e)}")
-
-if __name__ == "__main__":
+import streamlit as st
+import streamlit.components.v1 as components
+import numpy as np
+from PIL import Image
+import base64
+import io
+import queue
+import time
+import av
+
+
+
+# Try to import OpenCV with specific version
+try:
+    import cv2
+    OPENCV_AVAILABLE = True
+except ImportError as e:
+    OPENCV_AVAILABLE = False
+    st.sidebar.warning("⚠️ OpenCV not available - video features disabled")
+
+try:
+    from streamlit_webrtc import webrtc_streamer, WebRtcMode, VideoProcessorBase
+    WEBRTC_AVAILABLE = True
+except ImportError:
+    WEBRTC_AVAILABLE = False
+
+# Set page configuration
+st.set_page_config(
+    page_title="ASCII Art Converter",
+    page_icon="🎨",
+    layout="wide"
+)
+
+# Custom CSS
+st.markdown("""
+<style>
+    .ascii-art {
+        font-family: 'Courier New', monospace;
+        line-height: 1;
+        white-space: pre;
+        overflow-x: auto;
+        font-size: 8px;
+    }
+    div[data-testid="stText"] {
+        font-family: 'Courier New', monospace;
+        line-height: 1;
+        font-size: 8px;
+    }
+    .video-container {
+        max-width: 100%;
+        border-radius: 10px;
+    }
+    .stButton button {
+        width: 100%;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# Two-digit hex strings for 0..255 so the span builder never formats integers;
+# #rrggbb is also ~30% fewer bytes than rgb(r,g,b)
+_HEX = [f"{i:02x}" for i in range(256)]
+
+def _build_palette_css():
+    # 3-3-2 bit palette: 256 fixed classes, injected once, so spans carry a
+    # short class name instead of an inline style
+    rules = ["<style>"]
+    for idx in range(256):
+        r = ((idx >> 5) & 0x7) * 255 // 7
+        g = ((idx >> 2) & 0x7) * 255 // 7
+        b = (idx & 0x3) * 255 // 3
+        rules.append(f".c{idx}{{color:#{_HEX[r]}{_HEX[g]}{_HEX[b]}}}")
+    rules.append("</style>")
+    return "".join(rules)
+
+
+_PALETTE_CSS = _build_palette_css()
+st.markdown(_PALETTE_CSS, unsafe_allow_html=True)
+
+# One opening tag per palette class, so emitting a run is pure lookup+concat
+_SPAN_OPEN = [f"<span class='c{i}'>" for i in range(256)]
+
+def _luminance(rgb):
+    """Grayscale from an RGB uint8 array in a single vectorized pass.
+
+    Fixed-point Rec.601 (weights scaled by 256): integer multiply-add and
+    a shift, with no float intermediate buffer. The worst case sum is
+    255 * 256, which still fits in uint16.
+    """
+    r = rgb[..., 0].astype(np.uint16)
+    g = rgb[..., 1].astype(np.uint16)
+    b = rgb[..., 2].astype(np.uint16)
+    return ((r * 77 + g * 150 + b * 29) >> 8).astype(np.uint8)
+
+
+class StreamlitASCIIConverter:
+    def __init__(self):
+        self.chars = "@%#*+=-:. "
+        self.precompute_char_mapping()
+    
+    def precompute_char_mapping(self):
+        # One contiguous 256-byte table: char_bytes for plain-Python use,
+        # char_lut as a zero-copy NumPy view for vectorized fancy-indexing
+        scale = len(self.chars) - 1
+        self.char_bytes = bytes(
+            ord(self.chars[min(i * scale // 255, scale)]) for i in range(256)
+        )
+        self.char_lut = np.frombuffer(self.char_bytes, dtype='S1')
+        self.char_codes = np.frombuffer(self.char_bytes, dtype=np.uint8)
+
+    def _char_grid(self, gray):
+        """Map a uint8 grayscale image to the (H, W) char grid."""
+        if OPENCV_AVAILABLE:
+            # cv2.LUT runs the 256-entry lookup through SIMD; it needs a
+            # contiguous input, which ascontiguousarray guarantees for free
+            # on the buffers we produce
+            codes = cv2.LUT(np.ascontiguousarray(gray), self.char_codes)
+            return codes.view('S1')
+        return self.char_lut[gray]
+
+    def _plain_text(self, ascii_chars):
+        """Linearize the char grid to text in one copy.
+
+        A newline column appended to the grid lets tobytes() produce the
+        whole multi-line string as a single memcpy, with no per-row joins.
+        """
+        height, width = ascii_chars.shape
+        out = np.empty((height, width + 1), dtype='S1')
+        out[:, :width] = ascii_chars
+        out[:, width] = b'\n'
+        return out.tobytes().decode('ascii')[:-1]
+
+    def _color_html(self, pixels_rgb, ascii_chars):
+        """Build the color markup, one span per run of same-colored pixels.
+
+        Colors are quantized to the 3-3-2 palette (256 CSS classes injected
+        once per page) so neighbouring pixels collapse into runs and each
+        span carries only a short class name; together that cuts the HTML
+        payload by an order of magnitude versus one styled span per pixel.
+        """
+        palette_idx = (
+            ((pixels_rgb[..., 0] >> 5) << 5)
+            | ((pixels_rgb[..., 1] >> 5) << 2)
+            | (pixels_rgb[..., 2] >> 6)
+        )
+        height, width = ascii_chars.shape
+        lines = []
+        for y in range(height):
+            row_idx = palette_idx[y]
+            row_chars = ascii_chars[y].tobytes().decode('ascii')
+            changed = np.empty(width, dtype=bool)
+            changed[0] = True
+            changed[1:] = row_idx[1:] != row_idx[:-1]
+            starts = np.flatnonzero(changed)
+            ends = np.append(starts[1:], width)
+            parts = []
+            for start, end in zip(starts, ends):
+                parts.append(
+                    _SPAN_OPEN[row_idx[start]]
+                    + row_chars[start:end] + "</span>"
+                )
+            lines.append("".join(parts))
+        return "\n".join(lines)
+
+    def frame_to_ascii(self, frame, width=80, color_mode=True):
+        """Convert frame to ASCII art"""
+        try:
+            if frame is None:
+                return "No frame", 0, 0
+                
+            original_height, original_width = frame.shape[:2]
+            aspect_ratio = original_height / original_width
+            
+            target_width = min(width, 120)
+            target_height = int(target_width * aspect_ratio * 0.5)
+            target_height = max(10, min(target_height, 80))
+            
+            # Cheap strided pre-decimation for much-larger-than-target
+            # frames: keep ~2x oversampling so the exact INTER_AREA resize
+            # below still averages, but runs over far fewer pixels
+            stride_y = max(1, original_height // (target_height * 2))
+            stride_x = max(1, original_width // (target_width * 2))
+            if stride_y > 1 or stride_x > 1:
+                frame = frame[::stride_y, ::stride_x]
+
+            # Resize frame first so both color conversions run on the tiny buffer
+            frame_resized = cv2.resize(
+                frame, (target_width, target_height),
+                interpolation=cv2.INTER_AREA
+            )
+            # Channel-reversed view, no copy; downstream indexing is all NumPy
+            frame_rgb = frame_resized[..., ::-1]
+            frame_gray = _luminance(frame_rgb)
+            
+            # Convert to ASCII via the precomputed LUT (one vectorized lookup)
+            ascii_chars = self._char_grid(frame_gray)
+
+            if color_mode:
+                body = self._color_html(frame_rgb, ascii_chars)
+                ascii_out = "".join(['<pre class="ascii-art">', body, "\n</pre>"])
+            else:
+                # Plain text; rendered downstream with st.text, no markup
+                ascii_out = self._plain_text(ascii_chars)
+            return ascii_out, target_width, target_height
+            
+        except Exception as e:
+            return f"Error: {str(e)}", 0, 0
+    
+    def frame_to_overlay(self, frame, width=80):
+        """Convert a frame to plain ASCII colored by a PNG overlay.
+
+        The char grid ships as text inside one <pre>; color comes from a
+        small data-URL PNG of the frame stretched behind it with
+        background-clip:text. For animated color frames this is a few KB
+        per update instead of span markup, and the browser paints it as a
+        single blit.
+        """
+        ascii_text, target_width, target_height = self.frame_to_ascii(
+            frame, width, color_mode=False
+        )
+        if target_width == 0:
+            return ascii_text, 0, 0
+
+        small = cv2.resize(
+            frame, (target_width, target_height),
+            interpolation=cv2.INTER_AREA
+        )
+        buf = io.BytesIO()
+        Image.fromarray(np.ascontiguousarray(small[..., ::-1])).save(buf, 'PNG')
+        b64 = base64.b64encode(buf.getvalue()).decode('ascii')
+
+        overlay = "".join([
+            '<pre class="ascii-art" style="',
+            f"background-image:url(data:image/png;base64,{b64});",
+            "background-size:100% 100%;",
+            "-webkit-background-clip:text;background-clip:text;",
+            'color:transparent">',
+            ascii_text, "\n</pre>",
+        ])
+        return overlay, target_width, target_height
+
+    def image_to_ascii(self, image, width=80, color_mode=True):
+        """Convert PIL Image to ASCII art"""
+        try:
+            # Modes without full per-pixel channels resample poorly, so
+            # convert those up front; everything else converts after the
+            # downsample, on far fewer pixels
+            if image.mode in ('1', 'P', 'PA'):
+                image = image.convert('RGB')
+
+            original_width, original_height = image.size
+            aspect_ratio = original_height / original_width
+            
+            target_width = min(width, 120)
+            target_height = int(target_width * aspect_ratio * 0.5)
+            target_height = max(10, min(target_height, 80))
+            
+            # Resize once, then compute grayscale from the small RGB array
+            # instead of converting and resizing the full-res image again
+            img_resized = image.resize(
+                (target_width, target_height), Image.Resampling.BILINEAR
+            )
+            if img_resized.mode != 'RGB':
+                img_resized = img_resized.convert('RGB')
+
+            pixels_rgb = np.array(img_resized)
+            pixels_gray = _luminance(pixels_rgb)
+            
+            ascii_chars = self._char_grid(pixels_gray)
+
+            if color_mode:
+                body = self._color_html(pixels_rgb, ascii_chars)
+                ascii_out = "".join(['<pre class="ascii-art">', body, "\n</pre>"])
+            else:
+                ascii_out = self._plain_text(ascii_chars)
+            return ascii_out, target_width, target_height
+            
+        except Exception as e:
+            return f"Error: {str(e)}", 0, 0
+
+# Styles for ASCII frames rendered in an iframe, which does not inherit the
+# page CSS injected above
+_ASCII_IFRAME_CSS = """
+<style>
+    body { margin: 0; }
+    .ascii-art {
+        font-family: 'Courier New', monospace;
+        line-height: 1;
+        white-space: pre;
+        overflow-x: auto;
+        font-size: 8px;
+    }
+</style>
+"""
+
+def render_ascii_frame(placeholder, ascii_out, color_mode, height=680):
+    """Render one animation/webcam frame into a placeholder.
+
+    Color frames go inside an isolated iframe, which keeps the per-frame
+    churn out of the main page's markdown pipeline and DOM diff; plain
+    text frames skip HTML handling entirely.
+    """
+    if color_mode:
+        with placeholder:
+            components.html(
+                _ASCII_IFRAME_CSS + _PALETTE_CSS + ascii_out, height=height
+            )
+    else:
+        placeholder.text(ascii_out)
+
+def display_ascii(ascii_out, color_mode):
+    """Show a converted still: raw markup in color mode, plain text otherwise."""
+    if color_mode:
+        st.markdown(ascii_out, unsafe_allow_html=True)
+    else:
+        st.text(ascii_out)
+
+if WEBRTC_AVAILABLE:
+    class ASCIIVideoProcessor(VideoProcessorBase):
+        """Receives webcam frames from the browser on the WebRTC thread.
+
+        A depth-1 queue hands the newest frame to the render fragment:
+        recv never blocks (a stale frame is dropped on overflow), so
+        capture and decode overlap with ASCII conversion on the script
+        side.
+        """
+
+        def __init__(self):
+            self.frame_queue = queue.Queue(maxsize=1)
+
+        def recv(self, frame):
+            img = frame.to_ndarray(format="bgr24")
+            try:
+                self.frame_queue.put_nowait(img)
+            except queue.Full:
+                try:
+                    self.frame_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    self.frame_queue.put_nowait(img)
+                except queue.Full:
+                    pass
+            return frame
+
+@st.cache_resource
+def get_converter():
+    """One converter - and its precomputed tables - shared across reruns."""
+    return StreamlitASCIIConverter()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def convert_image_bytes(_converter, image_bytes, width, color_mode):
+    """Cached image conversion keyed on the raw upload bytes and settings."""
+    if OPENCV_AVAILABLE:
+        # imdecode lands straight in a BGR uint8 array, skipping the
+        # PIL decode -> convert -> np.array copy chain
+        bgr = cv2.imdecode(
+            np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR
+        )
+        if bgr is not None:
+            return _converter.frame_to_ascii(bgr, width, color_mode)
+
+    # Fall back to PIL for formats cv2 cannot decode (e.g. gif)
+    image = Image.open(io.BytesIO(image_bytes))
+    return _converter.image_to_ascii(image, width, color_mode)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def convert_video_frame(_converter, _frame, cache_key, width, color_mode):
+    """Cached frame conversion keyed on (upload id, frame number) and settings."""
+    return _converter.frame_to_ascii(_frame, width, color_mode)
+
+@st.cache_resource(max_entries=4)
+def load_video_frames(_video_bytes, cache_key, max_side=320):
+    """Decode an uploaded video once into a (N, H, W, 3) BGR uint8 array.
+
+    PyAV decodes straight from the in-memory upload, so nothing round-trips
+    through a temp file. Caching the decoded frames turns every slider move
+    into an array index instead of a keyframe seek plus decode on the
+    compressed stream. The upload bytes are excluded from hashing
+    (cache_key carries the upload id) so reruns do not re-hash a
+    potentially huge file."""
+    frames = []
+    fps = 0.0
+    try:
+        with av.open(io.BytesIO(_video_bytes)) as container:
+            stream = container.streams.video[0]
+            if stream.average_rate:
+                fps = float(stream.average_rate)
+
+            for frame in container.decode(stream):
+                bgr = frame.to_ndarray(format='bgr24')
+                height, width = bgr.shape[:2]
+                scale = max_side / max(height, width)
+                if scale < 1:
+                    bgr = cv2.resize(
+                        bgr, (int(width * scale), int(height * scale)),
+                        interpolation=cv2.INTER_AREA
+                    )
+                frames.append(bgr)
+    except Exception:
+        return None, fps
+
+    if not frames:
+        return None, fps
+    return np.stack(frames), fps
+
+def main():
+    st.title("🎨 ASCII Art Converter")
+    st.markdown("Convert images, videos, and access webcam to create ASCII art!")
+    
+    # Initialize converter
+    converter = get_converter()
+    
+    # Sidebar settings
+    st.sidebar.title("⚙️ Settings")
+    ascii_width = st.sidebar.slider("ASCII Width", 30, 120, 80)
+    color_mode = st.sidebar.checkbox("Color Mode", value=True)
+    
+    # Main app
+    input_type = st.radio(
+        "Choose input type:",
+        ["Image", "Video", "Webcam"],
+        horizontal=True
+    )
+    
+    if input_type == "Image":
+        handle_image_input(converter, ascii_width, color_mode)
+    elif input_type == "Video":
+        if OPENCV_AVAILABLE:
+            handle_video_input(converter, ascii_width, color_mode)
+        else:
+            st.error("❌ Video processing requires OpenCV. This feature is not available in the current deployment.")
+            st.info("🔧 Try deploying with the compatible OpenCV version in requirements.txt")
+    elif input_type == "Webcam":
+        if OPENCV_AVAILABLE:
+            handle_webcam_input(converter, ascii_width, color_mode)
+        else:
+            st.error("❌ Webcam access requires OpenCV. This feature is not available in the current deployment.")
+            st.info("🔧 Try running this app locally for full webcam support")
+
+def handle_image_input(converter, ascii_width, color_mode):
+    st.subheader("📷 Image to ASCII")
+    
+    uploaded_file = st.file_uploader(
+        "Choose an image file", 
+        type=['jpg', 'jpeg', 'png', 'bmp', 'tiff', 'gif']
+    )
+    
+    if uploaded_file is not None:
+        try:
+            image = Image.open(uploaded_file)
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("Original Image")
+                st.image(image, use_column_width=True)
+                st.caption(f"Size: {image.size[0]} x {image.size[1]}")
+            
+            with col2:
+                st.subheader("ASCII Art")
+                with st.spinner("Converting..."):
+                    ascii_out, width, height = convert_image_bytes(
+                        converter, uploaded_file.getvalue(), ascii_width, color_mode
+                    )
+                    display_ascii(ascii_out, color_mode)
+                    st.caption(f"ASCII: {width} x {height} chars")
+                    
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+
+def handle_video_input(converter, ascii_width, color_mode):
+    st.subheader("🎥 Video to ASCII")
+    
+    uploaded_file = st.file_uploader(
+        "Choose a video file", 
+        type=['mp4', 'avi', 'mov', 'mkv']
+    )
+    
+    if uploaded_file is not None:
+        try:
+            with st.spinner("Decoding video..."):
+                frames, fps = load_video_frames(
+                    uploaded_file.getvalue(), uploaded_file.file_id
+                )
+
+            if frames is None:
+                st.error("❌ Could not open video file")
+                return
+
+            total_frames = len(frames)
+            st.info(f"📊 Video Info: {total_frames} frames, {fps:.1f} FPS")
+
+            # Frame navigation
+            frame_number = st.slider("Select Frame", 0, total_frames-1, 0, key="video_frame")
+
+            # Plain-text playback skips color span building and the HTML
+            # render path entirely - much higher FPS
+            fast_animation = st.checkbox("⚡ Fast animation (black & white)", value=False)
+
+            # Navigation buttons
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if st.button("⏮️ First Frame"):
+                    frame_number = 0
+                    st.rerun()
+            with col2:
+                if st.button("▶️ Play Animation"):
+                    play_video_animation(
+                        frames, fps, converter, ascii_width,
+                        color_mode and not fast_animation
+                    )
+            with col3:
+                if st.button("⏭️ Last Frame"):
+                    frame_number = total_frames - 1
+                    st.rerun()
+
+            # Display selected frame (plain array index, no decoder seek)
+            frame = frames[frame_number]
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.subheader("Original Frame")
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                st.image(frame_rgb, use_column_width=True)
+                st.caption(f"Frame {frame_number}/{total_frames-1}")
+
+            with col2:
+                st.subheader("ASCII Art")
+                ascii_out, width, height = convert_video_frame(
+                    converter, frame,
+                    (uploaded_file.file_id, frame_number),
+                    ascii_width, color_mode
+                )
+                display_ascii(ascii_out, color_mode)
+                st.caption(f"ASCII: {width} x {height} chars")
+
+        except Exception as e:
+            st.error(f"Video processing error: {str(e)}")
+
+def handle_webcam_input(converter, ascii_width, color_mode):
+    st.subheader("📹 Webcam to ASCII")
+
+    if not WEBRTC_AVAILABLE:
+        st.error("❌ Webcam streaming requires streamlit-webrtc. This feature is not available in the current deployment.")
+        return
+
+    st.info("""
+    **Webcam Access Notes:**
+    - The camera runs in your browser and streams frames to the app
+    - Grant camera permissions when prompted
+    - Use Chrome/Firefox for best compatibility
+    """)
+
+    # Ask the browser for roughly the smallest capture that still
+    # oversamples the ASCII grid ~4x; shipping 640x480 frames to produce
+    # ~100 characters wastes bandwidth and resize work
+    capture_width = max(160, ascii_width * 4)
+    ctx = webrtc_streamer(
+        key="ascii-webcam",
+        mode=WebRtcMode.SENDRECV,
+        video_processor_factory=ASCIIVideoProcessor,
+        media_stream_constraints={
+            "video": {
+                "width": {"ideal": capture_width},
+                "height": {"ideal": capture_width * 3 // 4},
+            },
+            "audio": False,
+        },
+    )
+
+    if "webcam_stats" not in st.session_state:
+        st.session_state.webcam_stats = {"count": 0, "start": time.time()}
+
+    @st.fragment(run_every=1/24)
+    def render_latest_frame():
+        processor = ctx.video_processor
+        if not ctx.state.playing or processor is None:
+            return
+
+        # An empty queue means no frame newer than the last render; older
+        # frames were already dropped on the capture side
+        try:
+            frame = processor.frame_queue.get_nowait()
+        except queue.Empty:
+            return
+
+        stats = st.session_state.webcam_stats
+
+        # Skip conversion and render when the scene is static: a strided
+        # thumbnail comparison is orders of magnitude cheaper than the
+        # full pipeline it avoids
+        thumb = frame[::8, ::8].astype(np.int16)
+        last_thumb = stats.get("thumb")
+        if (last_thumb is not None and last_thumb.shape == thumb.shape
+                and np.abs(thumb - last_thumb).mean() < 2.0):
+            return
+        stats["thumb"] = thumb
+
+        # Convert to ASCII; color uses the PNG-overlay renderer, which is
+        # far lighter per frame than span markup
+        if color_mode:
+            ascii_out, width, height = converter.frame_to_overlay(
+                frame, ascii_width
+            )
+        else:
+            ascii_out, width, height = converter.frame_to_ascii(
+                frame, ascii_width, color_mode
+            )
+
+        # Calculate FPS
+        stats["count"] += 1
+        elapsed_time = time.time() - stats["start"]
+        fps = stats["count"] / elapsed_time if elapsed_time > 0 else 0
+
+        # Update display
+        # Size the iframe to the grid (8px glyphs plus a little slack)
+        render_ascii_frame(st.empty(), ascii_out, color_mode, height * 8 + 40)
+        st.info(
+            f"📊 Frame: {stats['count']} | FPS: {fps:.1f} | "
+            f"Size: {width}x{height} | Color: {'ON' if color_mode else 'OFF'}"
+        )
+
+    render_latest_frame()
+
+def play_video_animation(frames, fps, converter, ascii_width, color_mode):
+    """Play the decoded frames as an animation"""
+    st.info("🎬 Playing video animation...")
+
+    animation_placeholder = st.empty()
+    stop_animation = st.button("⏹️ Stop Animation")
+
+    target_dt = 1.0 / fps if fps > 0 else 0.1
+
+    try:
+        for frame in frames:
+            if stop_animation:
+                break
+
+            frame_start = time.perf_counter()
+
+            # Convert frame to ASCII; color playback uses the PNG-overlay
+            # renderer, which is far lighter per frame than span markup
+            if color_mode:
+                ascii_html, width, height = converter.frame_to_overlay(
+                    frame, ascii_width
+                )
+            else:
+                ascii_html, width, height = converter.frame_to_ascii(
+                    frame, ascii_width, color_mode
+                )
+
+            # Update animation
+            render_ascii_frame(
+                animation_placeholder, ascii_html, color_mode, height * 8 + 40
+            )
+
+            # Sleep only the remainder of the frame budget, so playback
+            # tracks the source FPS whether conversion is fast or slow
+            time.sleep(max(0.0, target_dt - (time.perf_counter() - frame_start)))
+
+    except Exception as e:
+        st.error(f"Animation error: {str(e)}")
+
+if __name__ == "__main__":
     main()
\ No newline at end of file